@@ -3,19 +3,140 @@ __author__ = 'Xyene'
 import bpy
 import sys
 import math
+import json
 
 
-for scene in bpy.data.scenes:
-    scene.render.resolution_x = int(sys.argv[-5])
-    scene.render.resolution_y = int(sys.argv[-4])
-    scene.render.resolution_percentage = 100
-    scene.render.use_border = False
+# Blender's command line format names, mapped to the names used by its API
+FORMATS = {
+    'TGA': 'TARGA',
+    'RAWTGA': 'TARGA_RAW',
+    'JPEG': 'JPEG',
+    'IRIS': 'IRIS',
+    'IRIZ': 'IRIS',
+    'PNG': 'PNG',
+    'BMP': 'BMP',
+    'HDR': 'HDR',
+    'TIFF': 'TIFF',
+    'EXR': 'OPEN_EXR',
+    'MULTILAYER': 'OPEN_EXR_MULTILAYER',
+    'CINEON': 'CINEON',
+    'DPX': 'DPX',
+    'JP2': 'JPEG2000',
+    'WEBP': 'WEBP',
+}
 
-for i, name in enumerate(['bottom', 'top', 'right', 'left', 'back', 'front']):
-    bpy.data.images[name].filepath = "%s" % sys.argv[-6 - i]
 
-camera = bpy.data.objects["Camera"]
-camera.rotation_mode = 'XYZ'
-camera.rotation_euler = (math.pi / 2 + float(sys.argv[-3]), float(sys.argv[-2]), float(sys.argv[-1]))
+def use_device(device):
+    """Selects the device Cycles renders on, falling back to the CPU."""
+    for scene in bpy.data.scenes:
+        scene.cycles.device = 'CPU'
 
-bpy.ops.render.render(animation=True)
+    if device == 'CPU':
+        return
+
+    types = ['OPTIX'] if device == 'OPTIX' else ['OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI']
+
+    try:
+        prefs = bpy.context.preferences.addons['cycles'].preferences
+        prefs.refresh_devices()
+    except (AttributeError, KeyError):
+        return
+
+    for device_type in types:
+        try:
+            devices = [d for d in prefs.get_devices_for_type(device_type) if d.type != 'CPU']
+        except (TypeError, ValueError):
+            continue
+
+        if devices:
+            prefs.compute_device_type = device_type
+            for d in prefs.devices:
+                d.use = d.type == device_type
+
+            for scene in bpy.data.scenes:
+                scene.cycles.device = 'GPU'
+            return
+
+
+def use_engine(engine):
+    """Selects the render engine, taking a single sample per pixel."""
+    for scene in bpy.data.scenes:
+        try:
+            scene.render.engine = engine
+        except TypeError:
+            # Blender 4.2 to 4.4 call the current Eevee BLENDER_EEVEE_NEXT
+            if engine != 'BLENDER_EEVEE':
+                raise
+            scene.render.engine = 'BLENDER_EEVEE_NEXT'
+
+        # The faces are emission-only, so sampling them needs no anti-aliasing
+        if scene.render.engine == 'CYCLES':
+            scene.cycles.samples = 1
+        elif scene.render.engine.startswith('BLENDER_EEVEE'):
+            scene.eevee.taa_render_samples = 1
+
+
+def setup(faces, width, height, rx, ry, rz, border=None):
+    for scene in bpy.data.scenes:
+        scene.render.resolution_x = width
+        scene.render.resolution_y = height
+        scene.render.resolution_percentage = 100
+        scene.render.use_border = border is not None
+
+        if border is not None:
+            # Render only a horizontal band, cropped to its own image
+            scene.render.use_crop_to_border = True
+            scene.render.border_min_x = 0
+            scene.render.border_max_x = 1
+            scene.render.border_min_y, scene.render.border_max_y = border
+
+    for name, path in zip(['front', 'back', 'left', 'right', 'top', 'bottom'], faces):
+        bpy.data.images[name].filepath = "%s" % path
+        bpy.data.images[name].reload()
+
+    camera = bpy.data.objects["Camera"]
+    camera.rotation_mode = 'XYZ'
+    camera.rotation_euler = (math.pi / 2 + rx, ry, rz)
+
+
+def serve():
+    """Renders jobs read as JSON lines from stdin, until stdin is closed."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        try:
+            job = json.loads(line)
+            setup(job['faces'], *job['resolution'], *job['rotation'])
+            use_device(job.get('device', 'CPU'))
+            use_engine(job.get('engine', 'CYCLES'))
+
+            for scene in bpy.data.scenes:
+                scene.render.filepath = job['output']
+                scene.render.use_file_extension = True
+                scene.render.image_settings.file_format = FORMATS.get(
+                    job['format'].upper(), job['format'].upper())
+                scene.render.threads_mode = 'FIXED' if job.get('threads') else 'AUTO'
+                if job.get('threads'):
+                    scene.render.threads = job['threads']
+
+            bpy.ops.render.render(animation=True)
+        except Exception as e:
+            print('ERROR %s' % str(e).replace('\n', ' '), flush=True)
+        else:
+            print('DONE', flush=True)
+
+
+args = sys.argv[sys.argv.index('--') + 1:]
+
+if args == ['--serve']:
+    serve()
+else:
+    # front back left right top bottom width height rx ry rz device engine [min_y max_y]
+    setup(args[0:6], int(args[6]), int(args[7]),
+          float(args[8]), float(args[9]), float(args[10]),
+          (float(args[13]), float(args[14])) if len(args) > 13 else None)
+    use_device(args[11])
+    use_engine(args[12])
+
+    bpy.ops.render.render(animation=True)
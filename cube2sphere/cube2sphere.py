@@ -1,9 +1,18 @@
 import argparse
+import atexit
+import csv
+import json
 import os
+import re
+import shutil
 import sys
 import subprocess
 import math
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .version import __version__
+from . import projection
 from typing import Optional
 
 try:
@@ -11,8 +20,62 @@ try:
 except ImportError:
     Image = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_PKG_DIR = os.path.dirname(os.path.realpath(__file__))
+_PROJECTOR = os.path.join(_PKG_DIR, "projector.blend")
+_INIT_PY = os.path.join(_PKG_DIR, "blender_init.py")
+
+
+# Blender output formats the native backend can write, mapped to the Pillow
+# format name, the file extension Blender would use and Pillow save options.
+NATIVE_FORMATS = {
+    "TGA": ("TGA", "tga", {"compression": "tga_rle"}),
+    "RAWTGA": ("TGA", "tga", {}),
+    "PNG": ("PNG", "png", {}),
+    "JPEG": ("JPEG", "jpg", {"quality": 90}),
+    "BMP": ("BMP", "bmp", {}),
+    "TIFF": ("TIFF", "tif", {}),
+    "WEBP": ("WEBP", "webp", {}),
+}
+
+# Faces decoded at this many pixels or more are memory-mapped by the native
+# backend rather than fully loaded.
+MAP_FACES_ABOVE = 4096 * 4096
+
+# Maps with fewer pixels are converted on the CPU even if a CUDA device could
+# be used, as setting up CUDA takes longer than the whole CPU conversion.
+GPU_MAP_ABOVE = 8192 * 4096
+
+# Number of directory entries read when checking that the cube faces exist,
+# before falling back to looking up the remaining faces one by one.
+SCAN_ENTRIES = 64
+
+# Line Blender prints once it has written a rendered image
+SAVED_PATTERN = re.compile(r"Saved: '.*'")
+
+# Devices that can be selected for rendering. GPU uses any supported GPU if
+# one is available and falls back to the CPU otherwise.
+DEVICES = ("CPU", "GPU", "OPTIX")
+
+# Blender render engines that can be selected. Only Cycles supports the
+# projector's panoramic camera; Eevee renders it as a perspective view.
+ENGINES = ("CYCLES", "BLENDER_EEVEE", "BLENDER_EEVEE_NEXT")
+
 
 class Cube2Sphere:
+    # Persistent Blender processes by executable path, with a lock serializing
+    # the jobs sent to each of them.
+    _workers: dict = {}
+    _workers_lock = threading.Lock()
+
+    # Blender executables resolved through PATH, by the path they were given as
+    _blender_executables: dict = {}
+
     def __init__(
         self,
         front: os.PathLike,
@@ -28,6 +91,9 @@ class Cube2Sphere:
         blender_path: os.PathLike = "blender",
         threads: Optional[int] = None,
         verbose: bool = False,
+        persistent: bool = False,
+        device: str = "GPU",
+        engine: str = "CYCLES",
     ):
         """Initializes the Cube2Sphere object.
 
@@ -45,6 +111,9 @@ class Cube2Sphere:
             blender_path (os.PathLike, optional): Path to the Blender executable. Defaults to "blender".
             threads (Optional[int], optional): Number of threads to use when rendering. Defaults to None.
             verbose (bool, optional): Enable verbose logging. Defaults to False.
+            persistent (bool, optional): Keep Blender running between conversions instead of starting it for each one. Defaults to False.
+            device (str, optional): Device to render on, one of "CPU", "GPU" or "OPTIX". Defaults to "GPU".
+            engine (str, optional): Blender render engine to use, one of ENGINES. Defaults to "CYCLES".
         """
 
         self.faces = {
@@ -64,6 +133,12 @@ class Cube2Sphere:
         self.blender_path = blender_path
         self.threads = threads
         self.verbose = verbose
+        self.persistent = persistent
+        self.device = device.upper()
+        self.engine = engine.upper()
+
+        # Size of the front face, once it was read to detect the resolution
+        self.front_size = None
 
     def validate(self) -> None:
         """Validates the input arguments.
@@ -71,58 +146,461 @@ class Cube2Sphere:
         Raises:
             ValueError: If any of the cube faces are not valid files.
             ValueError: If the number of threads is out of range.
+            ValueError: If the device is not supported.
+            ValueError: If the render engine is not supported.
             ImportError: If Pillow is not installed and image resolution detection is required.
         """
 
-        if not all(os.path.isfile(face) for face in self.faces.values()):
+        if not self.faces_exist():
             raise ValueError("All cube faces must be valid files")
 
-        if not self.resolution or self.resolution == (0, 0):
+        self.detect_resolution()
+
+        if self.threads and (self.threads < 1 or self.threads > 64):
+            raise ValueError("Too many threads specified (range is 1-64)")
+
+        if self.device not in DEVICES:
+            raise ValueError(f"Unsupported device (choose from {', '.join(DEVICES)})")
+
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unsupported engine (choose from {', '.join(ENGINES)})")
+
+    def detect_resolution(self) -> None:
+        """Sets the resolution from the size of the front face, if it is unspecified.
+
+        Raises:
+            ImportError: If Pillow is not installed.
+        """
+        if not self.resolution or tuple(self.resolution) == (0, 0):
             if not Image:
                 raise ImportError("Image resolution detection requires Pillow")
 
             front = self.faces["front"]
             with Image.open(front) as img:
-                width, height = img.size
+                width, height = self.front_size = img.size
                 self.resolution = (width * 4, height * 2)
 
-        if self.threads and (self.threads < 1 or self.threads > 64):
-            raise ValueError("Too many threads specified (range is 1-64)")
-
     def convert(self) -> None:
         """Converts the cube faces to a sphere.
 
+        Uses the native backend if NumPy and Pillow are installed and the
+        output format is supported by it, and Blender otherwise. Large maps
+        are converted on a CUDA device (see use_gpu). Without NumPy,
+        supported formats are still rendered with Pillow alone.
+        """
+        if self.native_available():
+            if self.use_gpu():
+                self.convert_gpu()
+            else:
+                self.convert_native()
+        elif Image is not None and self.format.upper() in NATIVE_FORMATS:
+            self.convert_pillow()
+        else:
+            self.convert_blender()
+
+    def native_available(self) -> bool:
+        """Checks whether the native backend can be used for this conversion.
+
+        Returns:
+            bool: True if NumPy and Pillow are installed and the output format is supported.
+        """
+        return (
+            np is not None
+            and Image is not None
+            and self.format.upper() in NATIVE_FORMATS
+        )
+
+    def use_gpu(self) -> bool:
+        """Checks whether the native backend should run on a CUDA device.
+
+        This is the case for maps of at least GPU_MAP_ABOVE pixels, unless the
+        CPU was selected, if PyTorch can use a CUDA device. Smaller maps are
+        only converted on the GPU by calling convert_gpu directly.
+
+        Returns:
+            bool: True if convert would use convert_gpu.
+        """
+        if self.device == "CPU" or not self.native_available():
+            return False
+
+        try:
+            self.detect_resolution()
+        except OSError:
+            # Reported by validate once the map is converted
+            return False
+
+        width, height = self.resolution
+        return width * height >= GPU_MAP_ABOVE and projection.cuda_available()
+
+    def convert_native(self) -> None:
+        """Converts the cube faces to a sphere in-process using NumPy and Pillow.
+
+        Raises:
+            ImportError: If NumPy or Pillow is not installed.
+            ValueError: If the output format is not supported by the native backend.
+        """
+        self.validate_native()
+
+        faces = None
+        width, height = self.face_size()
+        if width * height >= MAP_FACES_ABOVE:
+            faces = self.map_faces((width, height))
+
+        width, height = self.resolution
+        equirect = projection.remap(
+            self.load_faces() if faces is None else faces,
+            width,
+            height,
+            self.rotation,
+            threads=self.threads,
+        )
+        del faces
+
+        self.save_map(Image.fromarray(equirect))
+
+    def convert_gpu(self) -> None:
+        """Converts the cube faces to a sphere on a CUDA device using PyTorch.
+
+        Raises:
+            ImportError: If NumPy, Pillow or PyTorch is not installed.
+            RuntimeError: If no CUDA device is available.
+            ValueError: If the output format is not supported by the native backend.
+        """
+        try:
+            import torch
+        except ImportError as e:
+            raise ImportError("The GPU backend requires PyTorch") from e
+
+        if not torch.cuda.is_available():
+            raise RuntimeError("The GPU backend requires a CUDA device")
+
+        self.validate_native()
+
+        width, height = self.resolution
+        equirect = projection.remap_torch(
+            self.load_faces(), width, height, self.rotation, device="cuda"
+        )
+        self.save_map(Image.fromarray(equirect))
+
+    def convert_pillow(self) -> None:
+        """Converts the cube faces to a sphere in-process using only Pillow.
+
+        Slower and less exact than the native backend, but does not need NumPy.
+
+        Raises:
+            ImportError: If Pillow is not installed.
+            ValueError: If the output format is not supported by Pillow.
+        """
+        if Image is None:
+            raise ImportError("The Pillow backend requires Pillow")
+
+        if self.format.upper() not in NATIVE_FORMATS:
+            raise ValueError(
+                f"Output format {self.format} is not supported by the Pillow backend"
+            )
+
+        self.validate()
+
+        width, height = self.resolution
+        self.save_map(
+            projection.remap_pillow(
+                self.load_faces(as_array=False), width, height, self.rotation
+            )
+        )
+
+    def validate_native(self) -> None:
+        """Validates the input arguments for the native backends.
+
+        Raises:
+            ImportError: If NumPy or Pillow is not installed.
+            ValueError: If the output format is not supported by the native backend.
+        """
+        if np is None or Image is None:
+            raise ImportError("The native backend requires NumPy and Pillow")
+
+        if self.format.upper() not in NATIVE_FORMATS:
+            raise ValueError(
+                f"Output format {self.format} is not supported by the native backend"
+            )
+
+        self.validate()
+
+    def load_faces(self, as_array: bool = True) -> list:
+        """Loads the cube faces as RGB images.
+
+        The faces are decoded in parallel, as Pillow releases the GIL while
+        decoding. JPEG faces larger than the map needs are decoded at a
+        reduced scale.
+
+        Args:
+            as_array (bool, optional): Return NumPy arrays instead of Pillow images. Defaults to True.
+
+        Returns:
+            list: Face images, as numpy.ndarray or PIL.Image.Image, in the order of self.faces.
+        """
+        size = self.draft_size()
+
+        def load(path: os.PathLike):
+            with Image.open(path) as img:
+                img.draft("RGB", size)
+                img = img.convert("RGB")
+
+            return np.asarray(img) if as_array else img
+
+        with ThreadPoolExecutor(max_workers=len(self.faces)) as executor:
+            return list(executor.map(load, self.faces_paths()))
+
+    def draft_size(self) -> tuple[int, int]:
+        """Gets the smallest face size the map needs, used to decode faces at a reduced scale.
+
+        Returns:
+            tuple[int, int]: Width and height of a face at the resolution of the map.
+        """
+        width, height = self.resolution
+        return max(width // 4, 1), max(height // 2, 1)
+
+    def face_size(self) -> tuple[int, int]:
+        """Gets the size the front face is decoded at, without decoding it.
+
+        Reuses the size read by validate if the face is not drafted smaller.
+
+        Returns:
+            tuple[int, int]: Width and height of the front face.
+        """
+        if self.front_size == self.draft_size():
+            return self.front_size
+
+        with Image.open(self.absolute_path(self.faces["front"])) as img:
+            img.draft("RGB", self.draft_size())
+            return img.size
+
+    def map_faces(self, size: tuple[int, int]) -> Optional["np.ndarray"]:
+        """Loads the cube faces as one memory-mapped array.
+
+        The faces are decoded one at a time into a temporary file next to the
+        lookup tables, so that large faces are only paged in where they are
+        sampled. The file is deleted once the returned array is released.
+
+        Args:
+            size (tuple[int, int]): Width and height all faces are expected to be decoded at.
+
+        Returns:
+            Optional[numpy.ndarray]: Array of shape (6, height, width, 3), or None if the faces differ in size or the temporary file cannot be created.
+        """
+        face_width, face_height = size
+
+        try:
+            os.makedirs(projection.LUT_CACHE_DIR, exist_ok=True)
+            with tempfile.TemporaryFile(dir=projection.LUT_CACHE_DIR) as f:
+                faces = np.memmap(
+                    f,
+                    dtype=np.uint8,
+                    mode="w+",
+                    shape=(len(self.faces), face_height, face_width, 3),
+                )
+        except OSError:
+            return None
+
+        for index, path in enumerate(self.faces_paths()):
+            with Image.open(path) as img:
+                img.draft("RGB", self.draft_size())
+                if img.size != size:
+                    return None
+
+                faces[index] = np.asarray(img.convert("RGB"))
+
+        return faces
+
+    def save_map(self, equirect: "Image.Image") -> None:
+        """Writes a rendered map to the output path.
+
+        Args:
+            equirect (PIL.Image.Image): Equirectangular map.
+        """
+        output = self.output_path()
+        pil_format, _, options = NATIVE_FORMATS[self.format.upper()]
+
+        if self.verbose:
+            width, height = equirect.size
+            print(f"Writing {width}x{height} map to {output}")
+
+        if pil_format == "JPEG" and equirect.mode not in ("RGB", "L"):
+            equirect = equirect.convert("RGB")
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        equirect.save(output, pil_format, **options)
+
+    def output_path(
+        self, frame: int = 1, output: Optional[str] = None, fmt: Optional[str] = None
+    ) -> str:
+        """Gets the path of the rendered map, following Blender's naming scheme.
+
+        Blender replaces the last run of "#" in the output path with the
+        zero-padded frame number, or appends it as four digits if there is
+        none, and then adds the extension of the output format.
+
+        Args:
+            frame (int, optional): Frame number to insert. Defaults to 1.
+            output (Optional[str], optional): Output path to use instead of self.output. Defaults to None.
+            fmt (Optional[str], optional): Output format to use instead of self.format. Defaults to None.
+
+        Returns:
+            str: Path of the rendered map.
+        """
+        output = str(self.output if output is None else output)
+        match = re.search(r"#+(?!.*#)", output)
+
+        if match:
+            digits = str(frame).zfill(len(match.group()))
+            output = output[: match.start()] + digits + output[match.end() :]
+        else:
+            output += f"{frame:04d}"
+
+        _, extension, _ = NATIVE_FORMATS[(fmt or self.format).upper()]
+        return f"{output}.{extension}"
+
+    def convert_blender(self) -> None:
+        """Converts the cube faces to a sphere by rendering them in Blender.
+
         Raises:
             RuntimeError: If the Blender executable cannot be spawned.
             RuntimeError: If Blender exits with a non-zero return code.
         """
+        if self.persistent:
+            self.convert_worker()
+            return
+
         self.validate()
-        out = open(os.devnull, "w") if not self.verbose else None
-        faces_paths = [self.absolute_path(face) for face in self.faces.values()]
 
-        command = (
+        if self.strips() > 1:
+            self.convert_strips()
+            return
+
+        command = self.blender_command(self.output, self.threads)
+
+        if self.verbose:
+            print("Running command:")
+            print(" ".join(command))
+
+        returncode = self.spawn(command)
+        if returncode:
+            raise RuntimeError(f"Blender exited with error code {returncode}")
+
+    def strips(self) -> int:
+        """Gets the number of horizontal strips to render in separate Blender processes.
+
+        Cycles scales poorly beyond a handful of CPU threads, so large maps
+        rendered with Cycles on the CPU are split into strips rendered side by side, unless
+        a thread count was given. The strips are stitched with Pillow, which
+        limits this to formats it can read and write.
+
+        Returns:
+            int: Number of strips, 1 if the map is rendered in one piece.
+        """
+        if (
+            self.engine != "CYCLES"
+            or self.device != "CPU"
+            or self.threads is not None
+            or Image is None
+            or self.format.upper() not in NATIVE_FORMATS
+            or self.resolution[1] < 1024
+        ):
+            return 1
+
+        return max(min(os.cpu_count() or 1, 8), 1)
+
+    def convert_strips(self) -> None:
+        """Renders the map as horizontal strips in parallel Blender processes and stitches them.
+
+        Raises:
+            RuntimeError: If the Blender executable cannot be spawned.
+            RuntimeError: If Blender exits with a non-zero return code.
+        """
+        strips = self.strips()
+        width, height = self.resolution
+        bounds = [height * i // strips for i in range(strips + 1)]
+        threads = max((os.cpu_count() or 1) // strips, 1)
+
+        with tempfile.TemporaryDirectory(prefix="cube2sphere-") as directory:
+            outputs = [os.path.join(directory, f"strip{i}_") for i in range(strips)]
+            commands = [
+                self.blender_command(
+                    output,
+                    threads,
+                    # Blender measures borders from the bottom of the image and
+                    # truncates them to whole rows in single precision, so aim
+                    # for the middle of the row.
+                    (
+                        max((height - bottom + 0.5) / height, 0.0),
+                        min((height - top + 0.5) / height, 1.0),
+                    ),
+                    # Strips are stitched before encoding the map, so lossy
+                    # formats are only encoded once.
+                    "PNG",
+                )
+                for output, top, bottom in zip(outputs, bounds, bounds[1:])
+            ]
+
+            if self.verbose:
+                print(f"Rendering {strips} strips, running commands:")
+                for command in commands:
+                    print(" ".join(command))
+
+            with ThreadPoolExecutor(max_workers=strips) as executor:
+                returncodes = list(executor.map(self.spawn, commands))
+
+            for returncode in returncodes:
+                if returncode:
+                    raise RuntimeError(f"Blender exited with error code {returncode}")
+
+            equirect = None
+            for output, top in zip(outputs, bounds):
+                with Image.open(self.output_path(output=output, fmt="PNG")) as strip:
+                    if equirect is None:
+                        equirect = Image.new(strip.mode, (width, height))
+                    equirect.paste(strip, (0, top))
+
+            self.save_map(equirect)
+
+    def blender_command(
+        self,
+        output: os.PathLike,
+        threads: Optional[int] = None,
+        border: Optional[tuple[float, float]] = None,
+        fmt: Optional[str] = None,
+    ) -> list:
+        """Builds the command rendering the map with Blender.
+
+        Args:
+            output (os.PathLike): Path to save the output image, without frame number and extension.
+            threads (Optional[int], optional): Number of threads to use when rendering. Defaults to None.
+            border (Optional[tuple[float, float]], optional): Bottom and top of the band of the map to render, from 0 at the bottom to 1 at the top. Defaults to None.
+            fmt (Optional[str], optional): Format to save the image in instead of self.format. Defaults to None.
+
+        Returns:
+            list: Command to run.
+        """
+        faces_paths = self.faces_paths()
+
+        return (
             [
-                self.blender_path,
-                "-E",
-                "CYCLES",
+                self.blender_executable(self.blender_path),
                 "--background",
                 "-noaudio",
                 "-b",
-                os.path.join(
-                    os.path.dirname(os.path.realpath(__file__)), "projector.blend"
-                ),
+                _PROJECTOR,
+                "--python-exit-code",
+                "1",
                 "-o",
-                self.output,
+                output,
                 "-F",
-                self.format,
+                fmt or self.format,
                 "-x",
                 "1",
                 "-P",
-                os.path.join(
-                    os.path.dirname(os.path.realpath(__file__)), "blender_init.py"
-                ),
+                _INIT_PY,
             ]
-            + (["-t", str(self.threads)] if self.threads else [])
+            + (["-t", str(threads)] if threads else [])
             + [
                 "--",
                 *faces_paths,
@@ -131,38 +609,261 @@ class Cube2Sphere:
                 str(self.rotation[0]),
                 str(self.rotation[1]),
                 str(self.rotation[2]),
+                self.device,
+                self.engine,
             ]
+            + ([str(border[0]), str(border[1])] if border else [])
         )
 
-        if self.verbose:
-            print("Running command:")
-            print(" ".join(command))
+    def spawn(self, command: list) -> int:
+        """Runs Blender until it has saved the rendered map, hiding its output unless verbose.
+
+        Blender's output is followed as it is written, and Blender is stopped
+        as soon as it reports having saved the map, skipping its cleanup. With
+        close_fds disabled, Python starts the process with posix_spawn where
+        available, which avoids the cost of forking a large parent process.
+        Python opens files as non-inheritable, so no descriptors leak into it.
 
+        Args:
+            command (list): Command to run, starting with the executable.
+
+        Raises:
+            RuntimeError: If the executable cannot be spawned.
+
+        Returns:
+            int: Exit code of the command, 0 if it was stopped after saving the map.
+        """
         try:
             process = subprocess.Popen(
                 command,
-                stderr=out,
-                stdout=out,
+                stdout=subprocess.PIPE,
+                stderr=None if self.verbose else subprocess.DEVNULL,
+                close_fds=False,
+                text=True,
+                bufsize=1,
+                errors="replace",
             )
         except Exception as e:
             raise RuntimeError("Error spawning blender executable") from e
-        else:
-            process.wait()
-            if process.returncode:
-                raise RuntimeError(
-                    f"Blender exited with error code {process.returncode}"
-                )
 
-    def absolute_path(self, path: os.PathLike) -> os.PathLike:
+        saved = threading.Event()
+
+        def follow() -> None:
+            for line in process.stdout:
+                if self.verbose:
+                    print(line, end="")
+
+                if not saved.is_set() and SAVED_PATTERN.match(line.strip()):
+                    saved.set()
+                    process.terminate()
+
+                    try:
+                        process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+
+        reader = threading.Thread(target=follow, daemon=True)
+        reader.start()
+
+        returncode = process.wait()
+        reader.join()
+
+        return 0 if saved.is_set() else returncode
+
+    def convert_worker(self) -> None:
+        """Converts the cube faces to a sphere using a persistent Blender process.
+
+        The process is started on first use and shared by all conversions
+        using the same Blender executable.
+
+        Raises:
+            RuntimeError: If the Blender executable cannot be spawned.
+            RuntimeError: If Blender fails to render the map or exits.
+        """
+        self.validate()
+
+        job = {
+            "faces": [os.fspath(path) for path in self.faces_paths()],
+            "resolution": [int(x) for x in self.resolution],
+            "rotation": self.rotation,
+            "output": os.fspath(self.output),
+            "format": self.format,
+            "threads": self.threads,
+            "device": self.device,
+            "engine": self.engine,
+        }
+
+        process, lock = self.get_worker(self.blender_path, self.verbose)
+
+        with lock:
+            try:
+                process.stdin.write(json.dumps(job) + "\n")
+                process.stdin.flush()
+            except OSError as e:
+                raise RuntimeError("Blender worker exited unexpectedly") from e
+
+            for line in process.stdout:
+                line = line.rstrip("\n")
+
+                if line == "DONE":
+                    return
+
+                if line.startswith("ERROR "):
+                    raise RuntimeError(f"Blender failed to render map: {line[6:]}")
+
+                if self.verbose:
+                    print(line)
+
+            raise RuntimeError(f"Blender exited with error code {process.wait()}")
+
+    @classmethod
+    def blender_executable(cls, blender_path: os.PathLike) -> os.PathLike:
+        """Resolves the Blender executable through PATH, caching the result.
+
+        Args:
+            blender_path (os.PathLike): Path or name of the Blender executable.
+
+        Returns:
+            os.PathLike: Full path of the executable, or blender_path if it cannot be found.
+        """
+        if blender_path not in cls._blender_executables:
+            cls._blender_executables[blender_path] = (
+                shutil.which(blender_path) or blender_path
+            )
+
+        return cls._blender_executables[blender_path]
+
+    @classmethod
+    def get_worker(
+        cls, blender_path: os.PathLike, verbose: bool = False
+    ) -> tuple[subprocess.Popen, threading.Lock]:
+        """Gets the persistent Blender process for an executable, starting it if needed.
+
+        Args:
+            blender_path (os.PathLike): Path to the Blender executable.
+            verbose (bool, optional): Show Blender's error output. Defaults to False.
+
+        Raises:
+            RuntimeError: If the Blender executable cannot be spawned.
+
+        Returns:
+            tuple[subprocess.Popen, threading.Lock]: The process, and the lock to hold while it renders a job.
+        """
+        with cls._workers_lock:
+            worker = cls._workers.get(blender_path)
+
+            if worker is None or worker[0].poll() is not None:
+                command = [
+                    cls.blender_executable(blender_path),
+                    "--background",
+                    "-noaudio",
+                    "-b",
+                    _PROJECTOR,
+                    "--python-exit-code",
+                    "1",
+                    "-P",
+                    _INIT_PY,
+                    "--",
+                    "--serve",
+                ]
+
+                try:
+                    process = subprocess.Popen(
+                        command,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=None if verbose else subprocess.DEVNULL,
+                        text=True,
+                        bufsize=1,
+                    )
+                except Exception as e:
+                    raise RuntimeError("Error spawning blender executable") from e
+
+                worker = cls._workers[blender_path] = (process, threading.Lock())
+
+            return worker
+
+    @classmethod
+    def close_workers(cls) -> None:
+        """Shuts down all persistent Blender processes."""
+        with cls._workers_lock:
+            for process, lock in cls._workers.values():
+                with lock:
+                    try:
+                        process.stdin.close()
+                    except OSError:
+                        pass
+                    process.wait()
+
+            cls._workers.clear()
+
+    def absolute_path(
+        self, path: os.PathLike, cwd: Optional[str] = None
+    ) -> os.PathLike:
         """Helper function to get the absolute path of a file.
 
         Args:
             path (os.PathLike): Path to the file.
+            cwd (Optional[str], optional): Working directory to resolve relative paths against. Looked up if not given. Defaults to None.
 
         Returns:
             os.PathLike: Absolute path of the file.
         """
-        return path if os.path.isabs(path) else os.path.join(os.getcwd(), path)
+        if os.path.isabs(path):
+            return path
+
+        return os.path.join(os.getcwd() if cwd is None else cwd, path)
+
+    def faces_exist(self) -> bool:
+        """Checks whether all cube faces are files.
+
+        Faces usually share a directory, in which case the start of its
+        listing is read instead of looking up every face on its own. Reading
+        stops once all faces were found, or after SCAN_ENTRIES entries so that
+        large directories cost no more than looking the faces up.
+
+        Returns:
+            bool: True if all faces are files.
+        """
+        paths = [os.fspath(path) for path in self.faces_paths()]
+        parents = {os.path.dirname(path) for path in paths}
+
+        if len(parents) == 1:
+            missing = {os.path.basename(path) for path in paths}
+
+            try:
+                with os.scandir(parents.pop()) as entries:
+                    for count, entry in enumerate(entries):
+                        if count >= SCAN_ENTRIES:
+                            break
+
+                        if entry.name in missing and entry.is_file():
+                            missing.discard(entry.name)
+                            if not missing:
+                                break
+            except OSError:
+                # The directory may be traversable without being listable
+                pass
+
+            # Faces not seen in the listing, including names that differ from
+            # it on case-insensitive filesystems, are looked up on their own
+            paths = [path for path in paths if os.path.basename(path) in missing]
+
+        return all(os.path.isfile(path) for path in paths)
+
+    def faces_paths(self) -> list[os.PathLike]:
+        """Gets the absolute paths of the cube faces.
+
+        Looks up the working directory once rather than for every face.
+
+        Returns:
+            list[os.PathLike]: Absolute paths of the faces, in the order of self.faces.
+        """
+        cwd = os.getcwd()
+        return [self.absolute_path(path, cwd) for path in self.faces.values()]
+
+
+atexit.register(Cube2Sphere.close_workers)
 
 
 def main():
@@ -231,6 +932,22 @@ def main():
         metavar="<count>",
         help="number of threads to use when rendering (1-64)",
     )
+    parser.add_argument(
+        "-d",
+        "--device",
+        type=str.upper,
+        default="GPU",
+        choices=DEVICES,
+        help="device to render on (defaults to GPU, falling back to CPU if none is available)",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        type=str.upper,
+        default="CYCLES",
+        choices=ENGINES,
+        help="Blender render engine (defaults to CYCLES, the only one supporting the panoramic projection)",
+    )
     parser.add_argument(
         "-V", "--verbose", action="store_true", help="enable verbose logging"
     )
@@ -252,6 +969,8 @@ def main():
             blender_path=args.blender_path,
             threads=args.threads,
             verbose=args.verbose,
+            device=args.device,
+            engine=args.engine,
         )
 
         if Image is None:
@@ -266,5 +985,187 @@ def main():
         sys.exit(1)
 
 
+def read_manifest(path: os.PathLike) -> list[dict]:
+    """Reads the jobs of a batch conversion.
+
+    CSV manifests need a header row, any other file is read as JSON lines.
+    Each job has the keys front, back, left, right, top, bottom and output,
+    and optionally format, width, height, rx, ry and rz.
+
+    Args:
+        path (os.PathLike): Path to the manifest.
+
+    Raises:
+        ValueError: If a job is missing a required key.
+
+    Returns:
+        list[dict]: Jobs in the order they appear in the manifest.
+    """
+    with open(path, newline="") as f:
+        if os.fspath(path).lower().endswith(".csv"):
+            jobs = [dict(row) for row in csv.DictReader(f)]
+        else:
+            jobs = [json.loads(line) for line in f if line.strip()]
+
+    required = ["front", "back", "left", "right", "top", "bottom", "output"]
+    for number, job in enumerate(jobs, 1):
+        missing = [key for key in required if not job.get(key)]
+        if missing:
+            raise ValueError(f"Job {number} is missing {', '.join(missing)}")
+
+    return jobs
+
+
+def main_batch():
+    """Main function to convert several cube maps listed in a manifest."""
+
+    parser = argparse.ArgumentParser(
+        prog="cube2sphere-batch",
+        description="""
+        Maps the cube faces listed in a manifest into equirectangular maps, several at a time.
+    """,
+    )
+
+    parser.add_argument(
+        "manifest",
+        type=str,
+        metavar="<manifest>",
+        help="CSV (with header) or JSON lines file listing front, back, left, right, top, bottom and output for each map",
+    )
+    parser.add_argument("-v", "--version", action="version", version=__version__)
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=int,
+        nargs=2,
+        default=[0, 0],
+        metavar=("<width>", "<height>"),
+        help="default resolution for rendered maps (auto-detected if unspecified)",
+    )
+    parser.add_argument(
+        "-R",
+        "--rotation",
+        type=int,
+        nargs=3,
+        default=[0, 0, 0],
+        metavar=("<rx>", "<ry>", "<rz>"),
+        help="default rotation in degrees to apply before rendering maps (z is up)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        default="TGA",
+        metavar="<name>",
+        help='default format to use when saving maps, i.e. "PNG" or "TGA"',
+    )
+    parser.add_argument(
+        "-b",
+        "--blender-path",
+        type=str,
+        default="blender",
+        metavar="<path>",
+        help='filename of the Blender executable (defaults to "blender")',
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        metavar="<count>",
+        help="number of maps to convert at once (defaults to the number of CPUs)",
+    )
+    parser.add_argument(
+        "-k",
+        "--blender-jobs",
+        type=int,
+        default=2,
+        metavar="<count>",
+        help="number of Blender processes and GPU conversions to run at once (defaults to 2)",
+    )
+    parser.add_argument(
+        "-d",
+        "--device",
+        type=str.upper,
+        default="GPU",
+        choices=DEVICES,
+        help="device to render on (defaults to GPU, falling back to CPU if none is available)",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        type=str.upper,
+        default="CYCLES",
+        choices=ENGINES,
+        help="Blender render engine (defaults to CYCLES, the only one supporting the panoramic projection)",
+    )
+    parser.add_argument(
+        "-V", "--verbose", action="store_true", help="enable verbose logging"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        jobs = read_manifest(args.manifest)
+    except Exception as e:
+        parser.print_usage()
+        print(f"cube2sphere-batch: error: {e}")
+        sys.exit(1)
+
+    projection.prefer_openmp()
+
+    # Shared by Blender processes and GPU conversions, which both compete for
+    # the GPU and a lot of memory.
+    blender_slots = threading.Semaphore(max(args.blender_jobs, 1))
+
+    def convert(job: dict) -> None:
+        cube2sphere = Cube2Sphere(
+            front=job["front"],
+            back=job["back"],
+            left=job["left"],
+            right=job["right"],
+            top=job["top"],
+            bottom=job["bottom"],
+            resolution=(
+                (int(job["width"]), int(job["height"]))
+                if job.get("width") and job.get("height")
+                else args.resolution
+            ),
+            rotation=[
+                float(job[axis]) if job.get(axis) not in (None, "") else default
+                for axis, default in zip(["rx", "ry", "rz"], args.rotation)
+            ],
+            output=job["output"],
+            fmt=job.get("format") or args.format,
+            blender_path=args.blender_path,
+            verbose=args.verbose,
+            device=args.device,
+            engine=args.engine,
+        )
+
+        if cube2sphere.native_available() and not cube2sphere.use_gpu():
+            cube2sphere.convert()
+        else:
+            with blender_slots:
+                cube2sphere.convert()
+
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=max(args.jobs or 1, 1)) as executor:
+        for job, future in [(job, executor.submit(convert, job)) for job in jobs]:
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"cube2sphere-batch: error: {job['output']}: {e}")
+            else:
+                if args.verbose:
+                    print(f"Converted {job['output']}")
+
+    if failed:
+        print(f"cube2sphere-batch: {failed} of {len(jobs)} conversions failed")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,893 @@
+import hashlib
+import math
+import mmap
+import os
+import tempfile
+import threading
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+
+# Bump whenever the layout or meaning of cached lookup tables changes.
+LUT_VERSION = 1
+
+LUT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+    "cube2sphere",
+)
+
+# Upper bound for the total size of the cached lookup tables, in bytes. Least
+# recently used tables are removed to stay below it, and larger tables are
+# not cached at all.
+LUT_CACHE_SIZE = 1 << 30
+
+# Order in which faces are stacked for the native backend, matching the order
+# of Cube2Sphere.faces.
+FACES = ("front", "back", "left", "right", "top", "bottom")
+
+# For every face: the world axis it looks down, the sign of that axis, and the
+# world directions of the image's right and up edges as seen from inside the
+# cube. World space matches the Blender projector: z is up, front is +y.
+FACE_BASES = (
+    (1, 1.0, (1.0, 0.0, 0.0), (0.0, 0.0, 1.0)),  # front
+    (1, -1.0, (-1.0, 0.0, 0.0), (0.0, 0.0, 1.0)),  # back
+    (0, -1.0, (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)),  # left
+    (0, 1.0, (0.0, -1.0, 0.0), (0.0, 0.0, 1.0)),  # right
+    (2, 1.0, (1.0, 0.0, 0.0), (0.0, -1.0, 0.0)),  # top
+    (2, -1.0, (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)),  # bottom
+)
+
+
+def rotation_matrix(rotation: tuple[float, float, float]) -> list[list[float]]:
+    """Builds the rotation matrix for an XYZ Euler rotation.
+
+    This is the rotation Blender applies to the projector's camera, so the
+    native backend produces the same orientation as the Blender one.
+
+    Args:
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+
+    Returns:
+        list[list[float]]: Row-major 3x3 rotation matrix (Rz @ Ry @ Rx).
+    """
+    cx, sx = math.cos(rotation[0]), math.sin(rotation[0])
+    cy, sy = math.cos(rotation[1]), math.sin(rotation[1])
+    cz, sz = math.cos(rotation[2]), math.sin(rotation[2])
+
+    return [
+        [cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx],
+        [sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx],
+        [-sy, cy * sx, cy * cx],
+    ]
+
+
+def direction(
+    x: float, y: float, width: int, height: int, matrix: list[list[float]]
+) -> tuple[float, float, float]:
+    """Computes the world direction seen at a point of the equirectangular map.
+
+    Args:
+        x (float): Horizontal position in pixels, 0 being the left edge of the map.
+        y (float): Vertical position in pixels, 0 being the top edge of the map.
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        matrix (list[list[float]]): Rotation matrix as returned by rotation_matrix.
+
+    Returns:
+        tuple[float, float, float]: Unit direction vector.
+    """
+    lon = x * (2 * math.pi / width) - math.pi
+    lat = math.pi / 2 - y * (math.pi / height)
+    d = (math.cos(lat) * math.sin(lon), math.cos(lat) * math.cos(lon), math.sin(lat))
+
+    return tuple(row[0] * d[0] + row[1] * d[1] + row[2] * d[2] for row in matrix)
+
+
+def face_of(xyz: tuple[float, float, float]) -> int:
+    """Gets the face a direction points at.
+
+    Args:
+        xyz (tuple[float, float, float]): Direction vector.
+
+    Returns:
+        int: Index of the face (see FACES).
+    """
+    axis = max(range(3), key=lambda i: abs(xyz[i]))
+
+    for index, (face_axis, sign, _, _) in enumerate(FACE_BASES):
+        if face_axis == axis and (xyz[axis] > 0) == (sign > 0):
+            return index
+
+
+def face_point(face: int, xyz: tuple[float, float, float]) -> tuple[float, float]:
+    """Projects a direction onto the plane of a face.
+
+    Args:
+        face (int): Index of the face (see FACES).
+        xyz (tuple[float, float, float]): Direction vector, pointing towards the face's side of the cube.
+
+    Returns:
+        tuple[float, float]: Horizontal and vertical position, in [0, 1] within the face.
+    """
+    axis, sign, right, up = FACE_BASES[face]
+    scale = 1 / max(xyz[axis] * sign, 1e-9)
+    s = (right[0] * xyz[0] + right[1] * xyz[1] + right[2] * xyz[2]) * scale
+    t = (up[0] * xyz[0] + up[1] * xyz[1] + up[2] * xyz[2]) * scale
+
+    return (s + 1) / 2, (1 - t) / 2
+
+
+def directions(
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    window: Optional[tuple[int, int, int, int]] = None,
+):
+    """Computes the world direction seen by every pixel of the equirectangular map.
+
+    Args:
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        window (Optional[tuple[int, int, int, int]], optional): Top, left, bottom and right edge of the part of the map to compute, bottom and right being exclusive. Defaults to the whole map.
+
+    Returns:
+        numpy.ndarray: Array of shape (3, height, width), or the size of the window, holding unit direction vectors.
+    """
+    top, left, bottom, right = window or (0, 0, height, width)
+    lon = (np.arange(left, right) + 0.5) * (2 * math.pi / width) - math.pi
+    lat = math.pi / 2 - (np.arange(top, bottom) + 0.5) * (math.pi / height)
+    lon, lat = np.meshgrid(lon, lat)
+
+    xyz = np.stack(
+        (np.cos(lat) * np.sin(lon), np.cos(lat) * np.cos(lon), np.sin(lat))
+    )
+
+    matrix = np.asarray(rotation_matrix(rotation))
+    return np.einsum("ij,jhw->ihw", matrix, xyz)
+
+
+def face_coordinates(xyz):
+    """Maps direction vectors onto the cube.
+
+    Args:
+        xyz (numpy.ndarray): Array of shape (3, ...) holding direction vectors.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Index of the face
+        hit by every direction (see FACES), and the horizontal and vertical
+        position within that face, both in [0, 1] with (0, 0) at the top left.
+    """
+    axis = np.argmax(np.abs(xyz), axis=0)
+    major = np.take_along_axis(xyz, axis[np.newaxis], axis=0)[0]
+
+    face = np.empty(axis.shape, dtype=np.uint8)
+    s = np.empty(axis.shape)
+    t = np.empty(axis.shape)
+
+    for index, (face_axis, sign, right, up) in enumerate(FACE_BASES):
+        mask = (axis == face_axis) & (np.sign(major) == sign)
+        d = xyz[:, mask]
+        scale = 1 / np.abs(major[mask])
+        face[mask] = index
+        s[mask] = (right[0] * d[0] + right[1] * d[1] + right[2] * d[2]) * scale
+        t[mask] = (up[0] * d[0] + up[1] * d[1] + up[2] * d[2]) * scale
+
+    return face, (s + 1) / 2, (1 - t) / 2
+
+
+def bilinear(image, x, y):
+    """Samples an image with bilinear filtering, clamping at the borders.
+
+    Args:
+        image (numpy.ndarray): Image of shape (height, width, channels).
+        x (numpy.ndarray): Horizontal sample positions in pixels.
+        y (numpy.ndarray): Vertical sample positions in pixels.
+
+    Returns:
+        numpy.ndarray: Sampled values of shape x.shape + (channels,).
+    """
+    height, width = image.shape[:2]
+
+    x = np.clip(x, 0, width - 1, dtype=np.float32)
+    y = np.clip(y, 0, height - 1, dtype=np.float32)
+    x0 = np.minimum(x.astype(np.intp), width - 2 if width > 1 else 0)
+    y0 = np.minimum(y.astype(np.intp), height - 2 if height > 1 else 0)
+    x1 = np.minimum(x0 + 1, width - 1)
+    y1 = np.minimum(y0 + 1, height - 1)
+    fx = (x - x0.astype(np.float32))[..., np.newaxis]
+    fy = (y - y0.astype(np.float32))[..., np.newaxis]
+
+    top = image[y0, x0] * (1 - fx) + image[y0, x1] * fx
+    bottom = image[y1, x0] * (1 - fx) + image[y1, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def pack_texels(faces):
+    """Packs equally sized faces into one array of 32-bit texels.
+
+    Storing every texel as a single uint32 lets the sampler fetch a whole RGBA
+    pixel with one gather instead of one per channel.
+
+    Args:
+        faces (list[numpy.ndarray]): Face images in the order given by FACES, each of shape (height, width, channels) with at most 4 channels.
+
+    Returns:
+        numpy.ndarray: Array of shape (6, height, width) and dtype uint32.
+    """
+    face_height, face_width, channels = faces[0].shape
+
+    texels = np.zeros((len(faces), face_height, face_width, 4), dtype=np.uint8)
+    for index, image in enumerate(faces):
+        texels[index, ..., :channels] = image
+
+    return texels.view(np.uint32)[..., 0]
+
+
+def gather_bilinear(texels, face, s, t):
+    """Samples packed faces with bilinear filtering, clamping at the borders.
+
+    Args:
+        texels (numpy.ndarray): Packed faces as returned by pack_texels.
+        face (numpy.ndarray): Index of the face to sample for every pixel.
+        s (numpy.ndarray): Horizontal position within the face in [0, 1].
+        t (numpy.ndarray): Vertical position within the face in [0, 1].
+
+    Returns:
+        numpy.ndarray: Sampled RGBA values of shape face.shape + (4,) and dtype uint8.
+    """
+    _, face_height, face_width = texels.shape
+    flat = texels.reshape(-1)
+
+    x = np.clip(s * face_width - 0.5, 0, face_width - 1, dtype=np.float32)
+    y = np.clip(t * face_height - 0.5, 0, face_height - 1, dtype=np.float32)
+    x0 = np.minimum(x.astype(np.int32), max(face_width - 2, 0))
+    y0 = np.minimum(y.astype(np.int32), max(face_height - 2, 0))
+    dx = np.minimum(face_width - 1 - x0, 1)
+    dy = np.minimum(face_height - 1 - y0, 1) * face_width
+    fx = (x - x0.astype(np.float32))[..., np.newaxis]
+    fy = (y - y0.astype(np.float32))[..., np.newaxis]
+
+    offset = (face.astype(np.int32) * face_height + y0) * face_width + x0
+
+    def fetch(index):
+        return np.take(flat, index).view(np.uint8).reshape(index.shape + (4,))
+
+    top = fetch(offset) * (1 - fx) + fetch(offset + dx) * fx
+    bottom = fetch(offset + dy) * (1 - fx) + fetch(offset + dy + dx) * fx
+    return np.clip(top * (1 - fy) + bottom * fy + 0.5, 0, 255).astype(np.uint8)
+
+
+def build_lut(
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    window: Optional[tuple[int, int, int, int]] = None,
+):
+    """Builds the lookup table mapping equirectangular pixels to the cube.
+
+    Args:
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        window (Optional[tuple[int, int, int, int]], optional): Part of the map to build the table for, as taken by directions. Defaults to the whole map.
+
+    Returns:
+        numpy.ndarray: Array of shape (3, height, width), or the size of the
+        window, and dtype float32 holding the face index (see FACES) and the
+        horizontal and vertical position within that face, both in [0, 1],
+        for every pixel.
+    """
+    face, s, t = face_coordinates(directions(width, height, rotation, window))
+    return np.stack((face, s, t)).astype(np.float32)
+
+
+def lut_path(width: int, height: int, rotation: tuple[float, float, float]) -> str:
+    """Gets the path the lookup table for a map is cached at.
+
+    Args:
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+
+    Returns:
+        str: Path of the cached table, which may not exist.
+    """
+    key = repr((LUT_VERSION, width, height, *(float(r) for r in rotation)))
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(LUT_CACHE_DIR, f"lut_{digest}.npy")
+
+
+def load_lut(
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    cache: bool = True,
+):
+    """Gets the lookup table for a map, reusing a cached copy if available.
+
+    Lookup tables only depend on the resolution and rotation of the map, so
+    they are cached in LUT_CACHE_DIR and memory-mapped on later conversions.
+    Failing to read or write the cache is not an error.
+
+    Args:
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        cache (bool, optional): Whether to use the on-disk cache. Defaults to True.
+
+    Returns:
+        numpy.ndarray: Lookup table as returned by build_lut.
+    """
+    if not cache:
+        return build_lut(width, height, rotation)
+
+    path = lut_path(width, height, rotation)
+
+    try:
+        lut = np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    else:
+        try:
+            # Mark the table as recently used
+            os.utime(path)
+        except OSError:
+            pass
+
+        return lut
+
+    lut = build_lut(width, height, rotation)
+    if lut.nbytes > LUT_CACHE_SIZE:
+        return lut
+
+    try:
+        os.makedirs(LUT_CACHE_DIR, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=LUT_CACHE_DIR, suffix=".npy")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, lut)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+        evict_luts(LUT_CACHE_SIZE)
+    except OSError:
+        pass
+
+    return lut
+
+
+def evict_luts(size: int) -> None:
+    """Removes the least recently used lookup tables from the cache.
+
+    Args:
+        size (int): Total size in bytes the cached tables may keep.
+    """
+    tables = []
+
+    with os.scandir(LUT_CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name.startswith("lut_") and entry.name.endswith(".npy"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                tables.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    tables.sort(reverse=True)
+    total = 0
+
+    for _, table_size, path in tables:
+        total += table_size
+        if total > size:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _sample(faces, face_width, face_height, channels, out, y, x, rx, ry, rz):
+    """Samples the cube in one direction into a pixel of the map.
+
+    Selects the face and blends it bilinearly in fixed point, straight from
+    and to uint8. Compiled with Numba and inlined into the remap kernels.
+
+    Args:
+        faces (numpy.ndarray): Face images of shape (6, height, width, channels) and dtype uint8, in the order given by FACES.
+        face_width (int): Width of the faces.
+        face_height (int): Height of the faces.
+        channels (int): Number of channels of the faces and map.
+        out (numpy.ndarray): Equirectangular map of shape (height, width, channels) and dtype uint8 to write to.
+        y (int): Row of the pixel.
+        x (int): Column of the pixel.
+        rx (float): X component of the direction.
+        ry (float): Y component of the direction.
+        rz (float): Z component of the direction.
+    """
+    ax, ay, az = abs(rx), abs(ry), abs(rz)
+
+    # Same face bases as FACE_BASES, ties going to the lowest axis.
+    if ax >= ay and ax >= az:
+        if rx > 0:
+            face, s, t = 3, -ry / ax, rz / ax
+        else:
+            face, s, t = 2, ry / ax, rz / ax
+    elif ay >= az:
+        if ry > 0:
+            face, s, t = 0, rx / ay, rz / ay
+        else:
+            face, s, t = 1, -rx / ay, rz / ay
+    else:
+        if rz > 0:
+            face, s, t = 4, rx / az, -ry / az
+        else:
+            face, s, t = 5, rx / az, ry / az
+
+    fx = min(max((s + 1) / 2 * face_width - 0.5, 0.0), face_width - 1.0)
+    fy = min(max((1 - t) / 2 * face_height - 0.5, 0.0), face_height - 1.0)
+    x0 = min(int(fx), max(face_width - 2, 0))
+    y0 = min(int(fy), max(face_height - 2, 0))
+    x1 = min(x0 + 1, face_width - 1)
+    y1 = min(y0 + 1, face_height - 1)
+
+    # Blend in 8.8 fixed point; the result fits comfortably in 32 bits.
+    wx = np.int32((fx - x0) * 256 + 0.5)
+    wy = np.int32((fy - y0) * 256 + 0.5)
+
+    for c in range(channels):
+        top = np.int32(faces[face, y0, x0, c]) * (256 - wx) + np.int32(
+            faces[face, y0, x1, c]
+        ) * wx
+        bottom = np.int32(faces[face, y1, x0, c]) * (256 - wx) + np.int32(
+            faces[face, y1, x1, c]
+        ) * wx
+        out[y, x, c] = (top * (256 - wy) + bottom * wy + 32768) >> 16
+
+
+def _make_remap_kernel(channels: int):
+    """Creates a remap kernel for faces with a given number of channels.
+
+    The kernel fuses the direction, face selection and bilinear sampling
+    steps of remap so that no per-pixel intermediate arrays are needed. The
+    channel count is baked in so that the per-channel blend is unrolled, and
+    the rotation is folded into per-row coefficients, leaving three fused
+    multiply-adds per pixel to find its direction.
+
+    Args:
+        channels (int): Number of channels of the faces and map.
+
+    Returns:
+        Callable: Kernel taking the stacked faces of shape (6, height, width, channels) and dtype uint8 in the order given by FACES, the map of shape (height, width, channels) and dtype uint8 to write to, and the rotation matrix as returned by rotation_matrix.
+    """
+
+    def kernel(faces, out, matrix):
+        height, width = out.shape[0], out.shape[1]
+        face_height, face_width = faces.shape[1], faces.shape[2]
+
+        sin_lon = np.empty(width, dtype=np.float32)
+        cos_lon = np.empty(width, dtype=np.float32)
+        for x in range(width):
+            lon = (x + 0.5) * (2 * math.pi / width) - math.pi
+            sin_lon[x] = math.sin(lon)
+            cos_lon[x] = math.cos(lon)
+
+        for y in numba.prange(height):
+            lat = math.pi / 2 - (y + 0.5) * (math.pi / height)
+            cos_lat = math.cos(lat)
+            sin_lat = math.sin(lat)
+
+            # The direction of (x, y) is matrix @ (cos_lat * sin_lon[x],
+            # cos_lat * cos_lon[x], sin_lat), linear in sin_lon and cos_lon.
+            ax = matrix[0, 0] * cos_lat
+            bx = matrix[0, 1] * cos_lat
+            cx = matrix[0, 2] * sin_lat
+            ay = matrix[1, 0] * cos_lat
+            by = matrix[1, 1] * cos_lat
+            cy = matrix[1, 2] * sin_lat
+            az = matrix[2, 0] * cos_lat
+            bz = matrix[2, 1] * cos_lat
+            cz = matrix[2, 2] * sin_lat
+
+            for x in range(width):
+                s = sin_lon[x]
+                c = cos_lon[x]
+
+                _sample(
+                    faces,
+                    face_width,
+                    face_height,
+                    channels,
+                    out,
+                    y,
+                    x,
+                    ax * s + bx * c + cx,
+                    ay * s + by * c + cy,
+                    az * s + bz * c + cz,
+                )
+
+    # Numba keys its on-disk cache on the closure as well, so every channel
+    # count is compiled once and reused by later processes.
+    return numba.njit(parallel=True, fastmath=True, cache=True)(kernel)
+
+
+# Numba's default threading layer does not support launching parallel kernels
+# from several threads at once; the kernel already uses all cores anyway.
+_remap_kernel_lock = threading.Lock()
+
+if numba is not None:
+    _sample = numba.njit(inline="always", fastmath=True, cache=True)(_sample)
+    # Kernels by number of channels, compiled on first use
+    _remap_kernels = {
+        channels: _make_remap_kernel(channels) for channels in range(1, 5)
+    }
+
+
+def prefer_openmp() -> None:
+    """Makes Numba prefer its OpenMP threading layer over TBB.
+
+    Parallel kernels launched from worker threads, as in batch conversions,
+    can hang interpreter shutdown with the TBB threading layer, which Numba
+    prefers by default. This changes Numba's settings for the whole process,
+    so it is left to applications to call, before the first conversion. It
+    does nothing if the threading layer was chosen through the environment.
+    """
+    if numba is None or any(
+        key in os.environ
+        for key in ("NUMBA_THREADING_LAYER", "NUMBA_THREADING_LAYER_PRIORITY")
+    ):
+        return
+
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+
+def remap(
+    faces,
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    cache: bool = True,
+    threads: Optional[int] = None,
+):
+    """Projects six cube faces onto an equirectangular map.
+
+    If Numba is installed and all faces have the same size, this runs a
+    compiled, multi-threaded kernel. Otherwise, it samples the faces through a
+    lookup table using NumPy. Faces stacked into a single array, which may be
+    memory-mapped, are sampled tile by tile to keep little of them resident.
+
+    Args:
+        faces (list[numpy.ndarray] | numpy.ndarray): Face images in the order given by FACES, each of shape (height, width, channels), or stacked into one array.
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        cache (bool, optional): Whether to cache the lookup table on disk. Defaults to True.
+        threads (Optional[int], optional): Number of threads to use with Numba. Defaults to None.
+
+    Returns:
+        numpy.ndarray: Equirectangular map of shape (height, width, channels) and dtype uint8.
+    """
+    out = np.empty((height, width, faces[0].shape[2]), dtype=np.uint8)
+    stacked = faces if isinstance(faces, np.ndarray) else None
+
+    if stacked is not None and numba is None:
+        return remap_tiled(stacked, width, height, rotation, cache)
+
+    if (
+        numba is not None
+        and faces[0].shape[2] in _remap_kernels
+        and all(face.shape == faces[0].shape for face in faces)
+    ):
+        matrix = np.asarray(rotation_matrix(rotation), dtype=np.float32)
+        if stacked is None:
+            stacked = np.stack(faces)
+
+        with _remap_kernel_lock:
+            # The thread count is per calling thread and outlives this call, so
+            # reset it every time rather than only when a limit is given.
+            limit = numba.config.NUMBA_NUM_THREADS
+            numba.set_num_threads(min(threads or limit, limit))
+
+            _remap_kernels[stacked.shape[3]](stacked, out, matrix)
+
+        return out
+
+    face, s, t = load_lut(width, height, rotation, cache)
+
+    if all(image.shape == faces[0].shape for image in faces):
+        channels = faces[0].shape[2]
+        out[...] = gather_bilinear(pack_texels(faces), face, s, t)[..., :channels]
+        return out
+
+    for index, image in enumerate(faces):
+        mask = face == index
+        face_height, face_width = image.shape[:2]
+        samples = bilinear(
+            image,
+            s[mask] * face_width - 0.5,
+            t[mask] * face_height - 0.5,
+        )
+        out[mask] = np.clip(samples + 0.5, 0, 255).astype(np.uint8)
+
+    return out
+
+
+def _will_need(faces, index: int, top: int, bottom: int) -> None:
+    """Tells the kernel that rows of a memory-mapped face are about to be read.
+
+    Args:
+        faces (numpy.ndarray): Stacked faces, possibly memory-mapped.
+        index (int): Index of the face.
+        top (int): First row that will be read.
+        bottom (int): Last row that will be read.
+    """
+    handle = getattr(faces, "_mmap", None)
+    if handle is None or not hasattr(handle, "madvise"):
+        return
+
+    row = faces.strides[1]
+    start = faces.offset + index * faces.strides[0] + top * row
+    aligned = start - start % mmap.PAGESIZE
+
+    try:
+        handle.madvise(
+            mmap.MADV_WILLNEED, aligned, start - aligned + (bottom - top + 1) * row
+        )
+    except (OSError, ValueError):
+        pass
+
+
+def remap_tiled(
+    faces,
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    cache: bool = True,
+    tile: int = 256,
+):
+    """Projects stacked cube faces onto an equirectangular map, one tile at a time.
+
+    Each tile of the map only reads the rectangles of the faces it samples,
+    so memory-mapped faces never have to be fully resident. The lookup table
+    is read from the cache if it is there, and built tile by tile otherwise.
+
+    Args:
+        faces (numpy.ndarray): Face images of shape (6, height, width, channels) and dtype uint8, in the order given by FACES.
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        cache (bool, optional): Whether to use a cached lookup table. Defaults to True.
+        tile (int, optional): Size of the tiles in pixels. Defaults to 256.
+
+    Returns:
+        numpy.ndarray: Equirectangular map of shape (height, width, channels) and dtype uint8.
+    """
+    lut = None
+    if cache:
+        try:
+            lut = np.load(lut_path(width, height, rotation), mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+
+    _, face_height, face_width, channels = faces.shape
+    out = np.empty((height, width, channels), dtype=np.uint8)
+
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            if lut is None:
+                window = (top, left, min(top + tile, height), min(left + tile, width))
+                face, s, t = build_lut(width, height, rotation, window)
+            else:
+                face, s, t = lut[:, top : top + tile, left : left + tile]
+
+            block = out[top : top + tile, left : left + tile]
+            x = s * face_width - 0.5
+            y = t * face_height - 0.5
+
+            for index in np.unique(face):
+                mask = face == index
+                xs, ys = x[mask], y[mask]
+
+                x0 = min(max(int(math.floor(xs.min())), 0), face_width - 1)
+                y0 = min(max(int(math.floor(ys.min())), 0), face_height - 1)
+                x1 = min(max(int(math.ceil(xs.max())) + 1, x0), face_width - 1)
+                y1 = min(max(int(math.ceil(ys.max())) + 1, y0), face_height - 1)
+
+                _will_need(faces, int(index), y0, y1)
+                region = faces[int(index), y0 : y1 + 1, x0 : x1 + 1]
+                samples = bilinear(region, xs - x0, ys - y0)
+                block[mask] = np.clip(samples + 0.5, 0, 255).astype(np.uint8)
+
+    return out
+
+
+def cuda_available() -> bool:
+    """Checks whether PyTorch is installed and can use a CUDA device.
+
+    PyTorch is slow to import, so it is only imported once a GPU conversion
+    is actually considered.
+
+    Returns:
+        bool: True if remap_torch can run on "cuda".
+    """
+    try:
+        import torch
+    except ImportError:
+        return False
+
+    return torch.cuda.is_available()
+
+
+def remap_torch(
+    faces,
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    device: str = "cuda",
+):
+    """Projects six cube faces onto an equirectangular map using PyTorch.
+
+    Directions and face selection are computed on the device, and each face is
+    sampled with grid_sample, which goes through the GPU's texture units.
+
+    Args:
+        faces (list[numpy.ndarray]): Face images in the order given by FACES, each of shape (height, width, channels).
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        device (str, optional): PyTorch device to run on. Defaults to "cuda".
+
+    Returns:
+        numpy.ndarray: Equirectangular map of shape (height, width, channels) and dtype uint8.
+    """
+    import torch
+    import torch.nn.functional as F
+
+    with torch.no_grad():
+        lon = (torch.arange(width, device=device) + 0.5) * (
+            2 * math.pi / width
+        ) - math.pi
+        lat = math.pi / 2 - (torch.arange(height, device=device) + 0.5) * (
+            math.pi / height
+        )
+        lat, lon = torch.meshgrid(lat, lon, indexing="ij")
+
+        cos_lat = torch.cos(lat)
+        xyz = torch.stack(
+            (cos_lat * torch.sin(lon), cos_lat * torch.cos(lon), torch.sin(lat))
+        )
+        matrix = torch.tensor(rotation_matrix(rotation), device=device)
+        xyz = torch.einsum("ij,jhw->ihw", matrix, xyz)
+
+        axis = torch.argmax(torch.abs(xyz), dim=0)
+        major = torch.gather(xyz, 0, axis.unsqueeze(0))[0]
+
+        out = torch.empty(
+            (faces[0].shape[2], height, width), dtype=torch.uint8, device=device
+        )
+
+        for index, (face_axis, sign, right, up) in enumerate(FACE_BASES):
+            mask = (axis == face_axis) & (torch.sign(major) == sign)
+            d = xyz[:, mask]
+            scale = 1 / torch.abs(major[mask])
+            s = (right[0] * d[0] + right[1] * d[1] + right[2] * d[2]) * scale
+            t = (up[0] * d[0] + up[1] * d[1] + up[2] * d[2]) * scale
+
+            # grid_sample expects (x, y) in [-1, 1] with y pointing down.
+            grid = torch.stack((s, -t), dim=-1).view(1, 1, -1, 2)
+            image = (
+                torch.tensor(faces[index], device=device)
+                .permute(2, 0, 1)
+                .unsqueeze(0)
+                .float()
+            )
+            samples = F.grid_sample(
+                image,
+                grid,
+                mode="bilinear",
+                padding_mode="border",
+                align_corners=False,
+            )
+            out[:, mask] = (samples[0, :, 0] + 0.5).clamp(0, 255).to(torch.uint8)
+
+        return out.permute(1, 2, 0).cpu().numpy()
+
+
+def remap_pillow(
+    faces,
+    width: int,
+    height: int,
+    rotation: tuple[float, float, float],
+    tile: int = 16,
+):
+    """Projects six cube faces onto an equirectangular map using only Pillow.
+
+    The map is cut into tiles, each of which lies on a single face and is
+    resampled from the matching quad of that face by Pillow's MESH transform.
+    Tiles crossing an edge of the cube are split until they do not.
+
+    Args:
+        faces (list[PIL.Image.Image]): Face images in the order given by FACES.
+        width (int): Width of the equirectangular map.
+        height (int): Height of the equirectangular map.
+        rotation (tuple[float, float, float]): Rotation around the x, y and z axes in radians.
+        tile (int, optional): Size of the tiles in pixels. Defaults to 16.
+
+    Returns:
+        PIL.Image.Image: Equirectangular map.
+    """
+    matrix = rotation_matrix(rotation)
+    meshes = [[] for _ in faces]
+
+    def add(x0: int, y0: int, x1: int, y1: int) -> None:
+        corners = [
+            direction(x, y, width, height, matrix)
+            for x, y in ((x0, y0), (x0, y1), (x1, y1), (x1, y0))
+        ]
+        center = direction((x0 + x1) / 2, (y0 + y1) / 2, width, height, matrix)
+        face = face_of(center)
+
+        if x1 - x0 > 1 or y1 - y0 > 1:
+            if any(face_of(corner) != face for corner in corners):
+                xm, ym = (x0 + x1 + 1) // 2, (y0 + y1 + 1) // 2
+                for box in (
+                    (x0, y0, xm, ym),
+                    (xm, y0, x1, ym),
+                    (x0, ym, xm, y1),
+                    (xm, ym, x1, y1),
+                ):
+                    if box[0] < box[2] and box[1] < box[3]:
+                        add(*box)
+                return
+
+        face_width, face_height = faces[face].size
+        quad = []
+        for corner in corners:
+            s, t = face_point(face, corner)
+            quad += [s * face_width, t * face_height]
+
+        meshes[face].append(((x0, y0, x1, y1), quad))
+
+    for y in range(0, height, tile):
+        for x in range(0, width, tile):
+            add(x, y, min(x + tile, width), min(y + tile, height))
+
+    out = Image.new("RGB", (width, height))
+    for image, mesh in zip(faces, meshes):
+        if not mesh:
+            continue
+
+        # Repeat the outermost texels so that samples along the edges of the
+        # face are not blended with the black outside of it.
+        face_width, face_height = image.size
+        padded = Image.new(image.mode, (face_width + 2, face_height + 2))
+        padded.paste(image.resize((face_width + 2, face_height + 2), Image.NEAREST))
+        padded.paste(image, (1, 1))
+        mesh = [(box, [c + 1 for c in quad]) for box, quad in mesh]
+
+        mask = Image.new("L", (width, height))
+        draw = ImageDraw.Draw(mask)
+        for (x0, y0, x1, y1), _ in mesh:
+            draw.rectangle((x0, y0, x1 - 1, y1 - 1), fill=255)
+
+        projected = padded.transform(
+            (width, height), Image.MESH, mesh, Image.BILINEAR
+        )
+        out.paste(projected, mask=mask)
+
+    return out